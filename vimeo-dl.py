@@ -2,17 +2,21 @@
 
 import sys
 import os
+import argparse
+import hashlib
+import json
 import logging
 import subprocess
 import shutil
 import tempfile
 import re
+import queue
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import Optional
-import questionary
-from questionary import Style
-from urllib.parse import urlparse
+from typing import Iterator, Optional, Union
 
 # Configure logging
 logging.basicConfig(
@@ -34,49 +38,388 @@ class DownloadError(Exception):
     """Raised when download fails."""
     pass
 
-def clean_progress_output(line: str) -> tuple[str, Optional[str]]:
-    """Categorize and clean yt-dlp output line (from merged stdout/stderr)."""
-    line = line.strip()
+# URL validators run on every keystroke of the URL prompts
+_VIMEO_URL_RE = re.compile(r'^https?://(?:[\w.-]+\.)?player\.vimeo\.com/\S+$', re.IGNORECASE)
+_GENERIC_URL_RE = re.compile(r'^https?://(?P<netloc>[^\s/]+)\S*$', re.IGNORECASE)
+
+# yt-dlp renders download progress through this template as
+# "[progress] <percent>|<total>|<estimate>|<speed>|<eta>", which splits without a regex.
+# Unknown sizes come through as "N/A"; fragment downloads usually only have an estimate.
+PROGRESS_TAG = '[progress]'
+PROGRESS_TEMPLATE = (
+    f"download:{PROGRESS_TAG} %(progress._percent_str)s"
+    "|%(progress._total_bytes_str)s|%(progress._total_bytes_estimate_str)s"
+    "|%(progress._speed_str)s|%(progress._eta_str)s"
+)
+_PROGRESS_FIELDS = 5
+_UNKNOWN_SIZES = ('N/A', 'NA', '')
+
+# Fallback patterns for yt-dlp's default output (clean_progress_output runs once per yt-dlp line)
+_PROGRESS_RE = re.compile(r'^\[download\]\s+\S+%\s+of\s.*?(?:[KMG]iB|bytes)')
+# One pass over error indicators; WARNING: is case-sensitive, the rest is not
+_ERROR_RE = re.compile(r'(?i:error:|yt-dlp: error:)|WARNING:(?i:.*unable to download video data)')
+
+def _handle_progress(line: str) -> tuple[str, Optional[str]]:
+    fields = [field.strip() for field in line[len(PROGRESS_TAG):].split('|')]
+    if len(fields) != _PROGRESS_FIELDS:
+        return "IGNORE", None  # Not our template
+    percent, total, estimate, speed, eta = fields
+    if total in _UNKNOWN_SIZES and estimate not in _UNKNOWN_SIZES:
+        total = f"~{estimate}"
+    return "PROGRESS", f"Progress: {percent} of {total} at {speed} ETA {eta}"
+
+def _handle_download(line: str) -> tuple[str, Optional[str]]:
+    # Standard yt-dlp download progress (e.g. an older yt-dlp ignoring the template)
+    if _PROGRESS_RE.match(line):  # Ensures it's like "[download] 10% of 100MiB"
+        return "PROGRESS", line.replace("[download]", "Progress:").strip()
+    if 'has already been downloaded' in line:
+        return "STATUS_INFO", "Video already downloaded. Skipping..."
+    return "IGNORE", None  # Destination: and other bookkeeping lines
 
-    # Priority 1: Standard yt-dlp download progress
-    if (
-        line.startswith('[download]') and
-        '%' in line and
-        ('MiB' in line or 'KiB' in line or 'GiB' in line or 'bytes' in line) and
-        ' of ' in line  # Ensures it's like "10% of 100MiB"
-    ):
-        cleaned_progress = line.replace("[download]", "Progress:").strip()
-        return "PROGRESS", cleaned_progress
-
-    # Simplified Status lines
-    if line.startswith('[vimeo]'):
-        if 'Extracting URL:' in line: return "STATUS_INFO", "Extracting info..."
-        if 'Downloading webpage' in line: return "STATUS_INFO", "Fetching page..."
-        return "IGNORE", None
+def _handle_vimeo(line: str) -> tuple[str, Optional[str]]:
+    if 'Extracting URL:' in line: return "STATUS_INFO", "Extracting info..."
+    if 'Downloading webpage' in line: return "STATUS_INFO", "Fetching page..."
+    return "IGNORE", None
 
-    if 'Merging formats' in line or ('[ffmpeg]' in line and 'Merging' in line.lower()):
+def _handle_merge(line: str) -> tuple[str, Optional[str]]:
+    if 'Merging' in line:
         return "STATUS_MERGE", "Merging streams..."
-    
-    if line.startswith('[info]') and 'Video title:' in line:
+    return "IGNORE", None
+
+def _handle_info(line: str) -> tuple[str, Optional[str]]:
+    if 'Video title:' in line:
         return "STATUS_INFO", line.replace("[info]", "Info:").strip()
-    if line.startswith('[download]') and 'Destination:' in line:
-        return "IGNORE", None 
-    if line.startswith('[download]') and 'has already been downloaded' in line:
-        return "STATUS_INFO", "Video already downloaded. Skipping..."
-    if line.startswith('[FixupM3u8]') or line.startswith('[FixupTimestamp]'):
-        return "STATUS_INFO", "Finalizing stream..."
+    return "IGNORE", None
+
+def _handle_fixup(line: str) -> tuple[str, Optional[str]]:
+    return "STATUS_INFO", "Finalizing stream..."
+
+# Bracketed yt-dlp tag -> handler for the rest of the line
+_TAG_HANDLERS = {
+    PROGRESS_TAG.strip('[]'): _handle_progress,
+    'download': _handle_download,
+    'vimeo': _handle_vimeo,
+    'Merger': _handle_merge,
+    'ffmpeg': _handle_merge,
+    'info': _handle_info,
+    'FixupM3u8': _handle_fixup,
+    'FixupTimestamp': _handle_fixup,
+}
+_TAG_RE = re.compile(r'\[(' + '|'.join(map(re.escape, _TAG_HANDLERS)) + r')\]')
+
+def clean_progress_output(line: str) -> tuple[str, Optional[str]]:
+    """Categorize and clean yt-dlp output line (from merged stdout/stderr)."""
+    line = line.strip()
+
+    match = _TAG_RE.match(line)
+    if match:
+        return _TAG_HANDLERS[match.group(1)](line)
 
     # Catch common error indicators
-    if (
-        line.lower().startswith('error:') or 
-        line.lower().startswith('yt-dlp: error:') or
-        (line.startswith('WARNING:') and 'unable to download video data' in line.lower()) or
-        (line.startswith('ERROR:') and 'giving up' in line.lower()) # yt-dlp can also just use plain ERROR:
-    ):
+    if _ERROR_RE.match(line):  # Also covers yt-dlp's plain "ERROR: ... giving up"
         return "ERROR_LINE", line
 
     return "IGNORE", None
 
+# Line starts that clean_progress_output can turn into something other than IGNORE
+_RENDERED_PREFIXES = tuple(f'[{tag}]'.encode() for tag in _TAG_HANDLERS) + (
+    b'ERROR', b'Error', b'error', b'WARNING:', b'yt-dlp', b'YT-DLP'
+)
+
+def parse_output_line(raw_line: bytes) -> tuple[str, Optional[str]]:
+    """Categorize a raw output line, decoding only lines that may be rendered."""
+    raw_line = raw_line.strip()
+    if not raw_line.startswith(_RENDERED_PREFIXES):
+        return "IGNORE", None
+    return clean_progress_output(raw_line.decode('utf-8', 'replace'))
+
+READ_CHUNK_SIZE = 65536
+PROGRESS_LINE_WIDTH = 80
+# Reused for every redraw; sized so 80 columns of 4-byte UTF-8 still fit
+_LINE_BUF = bytearray(4 * PROGRESS_LINE_WIDTH + 1)
+_LINE_VIEW = memoryview(_LINE_BUF)
+_BLANK = memoryview(b' ' * PROGRESS_LINE_WIDTH)
+
+def write_status_line(message: str) -> None:
+    """Overwrite the current terminal line with message, padded to the line width.
+
+    The caller flushes sys.stdout.buffer once it has finished redrawing.
+    """
+    encoded = message.encode('utf-8', 'replace')
+    size = len(encoded)
+    # Pad by characters, not bytes: a 3-byte spinner frame is still one column
+    end = size + max(PROGRESS_LINE_WIDTH - len(message), 0)
+    if end >= len(_LINE_BUF):
+        sys.stdout.buffer.write(encoded + b'\r')
+        return
+    _LINE_BUF[:size] = encoded
+    _LINE_BUF[size:end] = _BLANK[:end - size]
+    _LINE_BUF[end] = 0x0D  # '\r'
+    sys.stdout.buffer.write(_LINE_VIEW[:end + 1])
+
+# What the current terminal line holds; anything but idle ends in '\r' and needs a newline
+STATE_IDLE, STATE_PROGRESS, STATE_SPINNER = 0, 1, 2
+
+IDLE_TIMEOUT = 0.1  # Seconds the renderer waits for output before the spinner advances on its own
+
+def iter_output_lines(stream) -> Iterator[list[bytes]]:
+    """Yield the raw lines of each read from an unbuffered binary pipe.
+
+    Drains whatever is available in a single os.read and yields its complete
+    lines together. Splits on both \\r and \\n like the universal-newlines
+    text pipe did, keeping a trailing partial line until the rest arrives.
+    """
+    fd = stream.fileno()
+    pending = b''
+    while True:
+        chunk = os.read(fd, READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        if pending:  # Only copy when a line straddles two reads
+            chunk = pending + chunk
+        lines = chunk.splitlines()
+        pending = b'' if chunk.endswith((b'\r', b'\n')) else lines.pop()
+        # Drop the empty split between a \r and \n read in separate blocks
+        raw_lines = [raw_line for raw_line in lines if raw_line]
+        if raw_lines:
+            yield raw_lines
+    if pending:
+        yield [pending]
+
+def read_output_events(stream, events: queue.Queue) -> None:
+    """Reader thread: queue a list of (line_type, message) events per pipe read, then None at EOF."""
+    try:
+        for raw_lines in iter_output_lines(stream):
+            events.put([_safe_parse_output_line(raw_line) for raw_line in raw_lines])
+    finally:
+        events.put(None)
+
+def _safe_parse_output_line(raw_line: bytes) -> tuple[str, Optional[str]]:
+    # An unexpected line must not kill the reader: yt-dlp would block on a full pipe
+    try:
+        return parse_output_line(raw_line)
+    except Exception as e:
+        logger.debug(f"Failed to parse output line {raw_line!r}: {e}")
+        return "IGNORE", None
+
+READER_EXIT_GRACE = 5  # Seconds yt-dlp gets to exit once its output stops being read
+
+ARIA2C_MAX_CONNECTIONS = 16  # aria2c rejects --max-connection-per-server above this
+
+def _env_count(name: str, default: int) -> int:
+    """Read a positive integer setting from the environment, warning on bad values."""
+    value = os.environ.get(name)
+    if not value:
+        return default
+    try:
+        count = int(value)
+    except ValueError:
+        count = 0
+    if count < 1:
+        logger.warning(f"Ignoring {name}={value!r}: expected a positive integer, using {default}.")
+        return default
+    return count
+
+ARIA2C_SPLIT_SIZE_RANGE = (1024 ** 2, 1024 ** 3)  # aria2c accepts --min-split-size from 1M to 1024M
+_SIZE_RE = re.compile(r'(\d+)([KM]?)', re.IGNORECASE)
+
+def _env_split_size(name: str, default: str) -> str:
+    """Read an aria2c size setting such as 4M from the environment, warning on bad values."""
+    value = os.environ.get(name, '').strip()
+    if not value:
+        return default
+    match = _SIZE_RE.fullmatch(value)
+    low, high = ARIA2C_SPLIT_SIZE_RANGE
+    if match:
+        number, unit = match.groups()
+        size = int(number) * {'': 1, 'K': 1024, 'M': 1024 ** 2}[unit.upper()]
+        if low <= size <= high:
+            return value
+    logger.warning(f"Ignoring {name}={value!r}: expected a size from 1M to 1024M, using {default}.")
+    return default
+
+def build_aria2c_args(fast: bool = False) -> str:
+    """Build the aria2c --downloader-args value, honoring VIMEO_DL_ARIA_* overrides."""
+    connections = _env_count('VIMEO_DL_ARIA_X', ARIA2C_MAX_CONNECTIONS)
+    if connections > ARIA2C_MAX_CONNECTIONS:
+        logger.warning(
+            f"VIMEO_DL_ARIA_X={connections} exceeds aria2c's limit; using {ARIA2C_MAX_CONNECTIONS}."
+        )
+        connections = ARIA2C_MAX_CONNECTIONS
+    split = _env_count('VIMEO_DL_ARIA_S', 16)
+    # Fast links gain more from fewer, larger range requests than from many 1M ones
+    min_split_size = _env_split_size('VIMEO_DL_ARIA_K', '4M' if fast else '1M')
+    return (
+        f"aria2c:--max-connection-per-server={connections} --split={split} "
+        f"--min-split-size={min_split_size} --piece-length=1M --file-allocation=none "
+        "--console-log-level=warn --show-console-readout=true"
+    )
+
+CONCURRENT_FRAGMENTS = 8  # HLS/DASH fragments fetched in parallel
+
+RAM_TEMP_MARGIN = 1.25  # Headroom over a download's estimated size before RAM scratch is used
+
+def _temp_root() -> Optional[str]:
+    """Parent for the temporary directory: VIMEO_DL_TMPDIR if set, else tempfile's default."""
+    override = os.environ.get('VIMEO_DL_TMPDIR')
+    if override:
+        Path(override).mkdir(parents=True, exist_ok=True)
+        return override
+    return None
+
+def _ram_temp_root(required_bytes: int) -> Optional[str]:
+    """A writable RAM-backed directory with room for required_bytes, if there is one.
+
+    /dev/shm comes first; $XDG_RUNTIME_DIR is a small per-user dir that systemd
+    caps at a fraction of RAM, so it only helps with small downloads.
+    """
+    for candidate in ('/dev/shm', os.environ.get('XDG_RUNTIME_DIR')):
+        if not candidate or not os.path.isdir(candidate) or not os.access(candidate, os.W_OK):
+            continue
+        try:
+            stats = os.statvfs(candidate)
+        except (AttributeError, OSError):  # No statvfs on Windows
+            continue
+        if stats.f_bavail * stats.f_frsize > required_bytes:
+            return candidate
+    return None
+
+@lru_cache(maxsize=None)
+def _home_dir() -> Path:
+    """Path.home(), resolved once and only when first needed."""
+    return Path.home()
+
+REQUIRED_EXECUTABLES = ('yt-dlp', 'aria2c')
+
+@lru_cache(maxsize=1)
+def _missing_deps(names: tuple[str, ...]) -> tuple[str, ...]:
+    """Return the executables in names not found on PATH, looked up once per process."""
+    return tuple(name for name in names if shutil.which(name) is None)
+
+# Where each browser keeps its profile (and with it the cookie store), per platform
+_BROWSER_PROFILE_PATHS = {
+    'chrome': [
+        '~/.config/google-chrome',
+        '~/Library/Application Support/Google/Chrome',
+        '%LOCALAPPDATA%/Google/Chrome/User Data',
+    ],
+    'firefox': [
+        '~/.mozilla/firefox',
+        '~/snap/firefox/common/.mozilla/firefox',
+        '~/.var/app/org.mozilla.firefox/.mozilla/firefox',
+        '~/Library/Application Support/Firefox/Profiles',
+        '%APPDATA%/Mozilla/Firefox/Profiles',
+    ],
+    'edge': [
+        '~/.config/microsoft-edge',
+        '~/Library/Application Support/Microsoft Edge',
+        '%LOCALAPPDATA%/Microsoft/Edge/User Data',
+    ],
+    'brave': [
+        '~/.config/BraveSoftware/Brave-Browser',
+        '~/Library/Application Support/BraveSoftware/Brave-Browser',
+        '%LOCALAPPDATA%/BraveSoftware/Brave-Browser/User Data',
+    ],
+    'chromium': [
+        '~/.config/chromium',
+        '~/snap/chromium/common/chromium',
+        '~/Library/Application Support/Chromium',
+        '%LOCALAPPDATA%/Chromium/User Data',
+    ],
+    'safari': [
+        '~/Library/Containers/com.apple.Safari/Data/Library/Cookies/Cookies.binarycookies',
+        '~/Library/Cookies/Cookies.binarycookies',
+    ],
+}
+
+@lru_cache(maxsize=None)
+def _browser_available(name: str) -> bool:
+    """Whether a browser has a profile on disk, i.e. cookies worth handing to yt-dlp."""
+    paths = _BROWSER_PROFILE_PATHS.get(name)
+    if paths is None:
+        return True  # Unknown location; let yt-dlp decide
+    return any(os.path.exists(os.path.expandvars(os.path.expanduser(p))) for p in paths)
+
+PROBE_TIMEOUT = 15  # Seconds a cookie probe may take before it counts as failed
+PROBE_STAGGER = 0.2  # Delay between probe launches so Vimeo isn't hit all at once
+
+def _start_probe(browser: str, vimeo_url: str, referer_url: str) -> subprocess.Popen:
+    """Start extracting the video's info JSON using this browser's cookies."""
+    return subprocess.Popen(
+        [
+            "yt-dlp", "--dump-single-json", "--no-warnings",
+            "--cookies-from-browser", browser,
+            "--referer", referer_url,
+            vimeo_url
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL
+    )
+
+def _finish_probe(probe: subprocess.Popen) -> Optional[str]:
+    """Wait for a probe and return its info JSON; None if it failed or was terminated."""
+    try:
+        stdout, _ = probe.communicate(timeout=PROBE_TIMEOUT)
+    except subprocess.TimeoutExpired:
+        probe.kill()
+        probe.communicate()
+        return None
+    if probe.returncode != 0:
+        return None
+    return stdout.decode('utf-8', 'replace')
+
+def estimate_download_size(info: dict, format_id: Optional[str]) -> Optional[int]:
+    """Bytes the download will occupy according to the info JSON; None if unknown."""
+    def size(f: dict) -> Optional[int]:
+        return f.get('filesize') or f.get('filesize_approx')
+
+    if format_id:
+        for f in info.get('formats') or []:
+            if f.get('format_id') == format_id:
+                return size(f)
+        return None
+    # Formats yt-dlp picked for bestvideo+bestaudio when the info was extracted
+    requested = info.get('requested_formats')
+    if requested:
+        sizes = [size(f) for f in requested]
+        return sum(sizes) if all(sizes) else None
+    return size(info)
+
+def select_progressive_format(info: dict) -> Optional[str]:
+    """Return the id of a muxed MP4 as good as the best video stream, if there is one.
+
+    Downloading such a format directly skips the ffmpeg merge that
+    bestvideo+bestaudio needs.
+    """
+    formats = info.get('formats') or []
+    best_height = max(
+        (f.get('height') or 0 for f in formats if f.get('vcodec') != 'none'),
+        default=0
+    )
+    progressive = [
+        f for f in formats
+        if f.get('ext') == 'mp4' and f.get('vcodec') != 'none' and f.get('acodec') != 'none'
+    ]
+    if not progressive:
+        return None
+    best = max(progressive, key=lambda f: (f.get('height') or 0, f.get('tbr') or 0))
+    if (best.get('height') or 0) < best_height:
+        return None
+    return best.get('format_id')
+
+class UrlValidator:
+    """questionary validator for a URL prompt, reporting why the URL was rejected."""
+
+    def __init__(self, required_domain: Optional[str] = None):
+        self.required_domain = required_domain
+
+    def __call__(self, text: str) -> Union[bool, str]:
+        if VimeoDownloader.validate_url(text, self.required_domain):
+            return True
+        if self.required_domain:
+            return f"Please enter a valid {self.required_domain} URL"
+        return "Please enter a valid URL"
+
 class VimeoDownloader:
     SUPPORTED_BROWSERS = [
         'chrome',
@@ -87,47 +430,158 @@ class VimeoDownloader:
         'safari'
     ]
 
-    def __init__(self):
+    def __init__(self, fast: bool = False):
+        self.fast = fast
         self.check_dependencies()
-        self.style = Style([
+        self.setup_directories()
+
+    @cached_property
+    def style(self):
+        """Prompt style, built on first use so questionary is only imported when prompting."""
+        from questionary import Style
+        return Style([
             ('question', 'bold'),
             ('selected', 'underline'),
             ('pointer', 'bold')
         ])
-        self.setup_directories()
+
+    @property
+    def last_browser_file(self) -> Path:
+        """File recording the browser whose cookies worked last."""
+        return _home_dir() / '.cache' / 'vimeo_dl' / 'last_browser'
 
     def setup_directories(self) -> None:
         """Setup output and temporary directories."""
         # Create downloads directory in user's home
-        self.downloads_dir = Path.home() / 'Downloads' / 'vimeo_downloads'
+        self.downloads_dir = _home_dir() / 'Downloads' / 'vimeo_downloads'
         self.downloads_dir.mkdir(parents=True, exist_ok=True)
 
-        # Create temporary directory
-        self.temp_dir = Path(tempfile.mkdtemp(prefix='vimeo_dl_'))
+        self.ram_temp_dirs: list[Path] = []
+
+        # Create temporary directory, reusing one that is still around
+        if getattr(self, 'temp_dir', None) and self.temp_dir.exists():
+            return
+        self.temp_dir = Path(tempfile.mkdtemp(prefix='vimeo_dl_', dir=_temp_root()))
         logger.debug(f"Created temporary directory: {self.temp_dir}")
 
     def cleanup(self) -> None:
         """Clean up temporary files and directories."""
         try:
+            for ram_dir in getattr(self, 'ram_temp_dirs', []):
+                if ram_dir.exists():
+                    shutil.rmtree(ram_dir)
             if hasattr(self, 'temp_dir') and self.temp_dir.exists():
                 shutil.rmtree(self.temp_dir)
                 logger.debug("Cleaned up temporary directory")
         except Exception as e:
             logger.warning(f"Failed to clean up temporary directory: {e}")
 
+    def load_last_browser(self) -> Optional[str]:
+        """Return the browser whose cookies worked last time, if recorded."""
+        try:
+            browser = self.last_browser_file.read_text().strip()
+        except OSError:
+            return None
+        return browser if browser in self.SUPPORTED_BROWSERS else None
+
+    def save_last_browser(self, browser: str) -> None:
+        """Remember the browser whose cookies worked for the next run."""
+        try:
+            self.last_browser_file.parent.mkdir(parents=True, exist_ok=True)
+            self.last_browser_file.write_text(browser + "\n")
+        except OSError as e:
+            logger.debug(f"Failed to save last browser: {e}")
+
+    def ordered_browsers(self) -> list[str]:
+        """Installed browsers to try, starting with the last successful one."""
+        browsers = [b for b in self.SUPPORTED_BROWSERS if _browser_available(b)]
+        if not browsers:
+            # No profile found where expected; try them all rather than nothing
+            browsers = list(self.SUPPORTED_BROWSERS)
+        last = self.load_last_browser()
+        if last in browsers:
+            browsers.remove(last)
+            browsers.insert(0, last)
+        return browsers
+
+    def make_fragment_dir(self, info: Optional[dict], format_id: Optional[str]) -> Path:
+        """Directory for yt-dlp's temporary files, on RAM-backed storage if the video fits.
+
+        Falls back to the regular temporary directory when VIMEO_DL_TMPDIR is set
+        or the download size is unknown or too large.
+        """
+        if os.environ.get('VIMEO_DL_TMPDIR') or not info:
+            return self.temp_dir
+        size = estimate_download_size(info, format_id)
+        if not size:
+            return self.temp_dir
+        # Merging keeps both streams next to the merged output until it's moved
+        required = size * (1 if format_id else 2) * RAM_TEMP_MARGIN
+        ram_root = _ram_temp_root(int(required))
+        if ram_root is None:
+            return self.temp_dir
+        try:
+            fragment_dir = Path(tempfile.mkdtemp(prefix='vimeo_dl_', dir=ram_root))
+        except OSError as e:  # Full or read-only despite the checks above
+            logger.debug(f"Could not create temporary directory in {ram_root}: {e}")
+            return self.temp_dir
+        self.ram_temp_dirs.append(fragment_dir)
+        logger.debug(f"Using RAM-backed temporary directory: {fragment_dir}")
+        return fragment_dir
+
+    def info_cache_path(self, vimeo_url: str) -> Path:
+        """Where the info JSON for a URL is cached during this run."""
+        digest = hashlib.sha1(vimeo_url.encode()).hexdigest()[:16]
+        return self.temp_dir / f"info_{digest}.json"
+
+    def load_cached_info(self, vimeo_url: str) -> Optional[dict]:
+        """Return the cached info JSON for a URL, if a probe already fetched it."""
+        try:
+            return json.loads(self.info_cache_path(vimeo_url).read_text())
+        except (OSError, ValueError):
+            return None
+
+    def find_working_browser(self, browsers: list[str], vimeo_url: str, referer_url: str) -> Optional[str]:
+        """Probe browsers concurrently, returning the first whose cookies unlock the video.
+
+        The winning probe's info JSON is cached for load_cached_info.
+        """
+        probes = {}
+        executor = ThreadPoolExecutor(max_workers=len(browsers))
+        try:
+            futures = {}
+            for i, browser in enumerate(browsers):
+                if i:
+                    time.sleep(PROBE_STAGGER)
+                try:
+                    probe = _start_probe(browser, vimeo_url, referer_url)
+                except OSError as e:
+                    logger.debug(f"Failed to start {browser} probe: {e}")
+                    continue
+                probes[browser] = probe
+                futures[executor.submit(_finish_probe, probe)] = browser
+            for future in as_completed(futures):
+                info_json = future.result()
+                if not info_json:
+                    continue
+                try:
+                    self.info_cache_path(vimeo_url).write_text(info_json)
+                except OSError as e:
+                    logger.debug(f"Failed to cache video info: {e}")
+                return futures[future]
+            return None
+        finally:
+            # Stop the losing probes so they neither compete with the download nor delay exit
+            for probe in probes.values():
+                if probe.poll() is None:
+                    probe.terminate()
+            executor.shutdown(wait=False, cancel_futures=True)
+
     @staticmethod
     def check_dependencies() -> None:
         """Verify all required dependencies are installed."""
-        missing = []
-        
-        # Check yt-dlp
-        if not shutil.which('yt-dlp'):
-            missing.append('yt-dlp')
-        
-        # Check aria2c
-        if not shutil.which('aria2c'):
-            missing.append('aria2c')
-        
+        missing = _missing_deps(REQUIRED_EXECUTABLES)
+
         if missing:
             raise DependencyError(
                 f"Missing required dependencies: {', '.join(missing)}. "
@@ -137,28 +591,32 @@ class VimeoDownloader:
     @staticmethod
     def validate_url(url: str, required_domain: Optional[str] = None) -> bool:
         """Validate URL format and optionally check domain."""
-        try:
-            result = urlparse(url)
-            if not all([result.scheme, result.netloc]):
-                return False
-            if required_domain and required_domain not in result.netloc:
-                return False
-            return True
-        except Exception:
+        if required_domain == 'player.vimeo.com':
+            return bool(_VIMEO_URL_RE.match(url))
+        match = _GENERIC_URL_RE.match(url)
+        if not match:
             return False
+        if required_domain and required_domain not in match.group('netloc'):
+            return False
+        return True
 
     def get_urls(self) -> tuple[str, str]:
         """Get and validate Vimeo and referer URLs from user."""
+        import questionary  # Deferred: pulls in prompt_toolkit, which is slow to import
+
         while True:
+            # Validate on submit only, not on every keystroke
             vimeo_url = questionary.text(
                 "Enter Vimeo player URL:",
-                validate=lambda text: self.validate_url(text, 'player.vimeo.com'),
+                validate=UrlValidator('player.vimeo.com'),
+                validate_while_typing=False,
                 style=self.style
             ).ask()
 
             referer_url = questionary.text(
                 "Enter the page URL where the video is embedded:",
-                validate=lambda text: self.validate_url(text),
+                validate=UrlValidator(),
+                validate_while_typing=False,
                 style=self.style
             ).ask()
 
@@ -169,86 +627,144 @@ class VimeoDownloader:
         
         download_successful = False
         last_error_message = "Unknown error."
-
-        for browser in self.SUPPORTED_BROWSERS:
+        aria2c_args = build_aria2c_args(self.fast)
+
+        browsers = self.ordered_browsers()
+        info = self.load_cached_info(vimeo_url)
+        if info is None:
+            logger.info("Checking browser cookies...")
+            working = self.find_working_browser(browsers, vimeo_url, referer_url)
+            if working:
+                # Download with the winner first; the rest remain as fallbacks
+                browsers.remove(working)
+                browsers.insert(0, working)
+                info = self.load_cached_info(vimeo_url)
+
+        format_id = select_progressive_format(info) if info else None
+        format_spec = "bestvideo+bestaudio/best"
+        if format_id:
+            logger.info("Single-file MP4 available, no merge needed.")
+            # The ID comes from one probe's JSON; other sessions may not be offered it
+            format_spec = f"{format_id}/{format_spec}"
+        # Only takes effect when yt-dlp actually merges streams
+        format_args = ["-f", format_spec, "--merge-output-format", "mp4"]
+
+        fragment_dir = self.make_fragment_dir(info, format_id)
+
+        # Built once; only the --cookies-from-browser value changes between attempts
+        command = [
+            "yt-dlp",
+            "--cookies-from-browser", None,
+            "--referer", referer_url,
+            *format_args,
+            "--downloader", "aria2c",
+            "--downloader-args", aria2c_args,
+            "--concurrent-fragments", str(CONCURRENT_FRAGMENTS),
+            "--progress",
+            "--progress-template", PROGRESS_TEMPLATE,
+            "--newline", # Force each progress update to be on a new line from yt-dlp
+            "--paths", f"temp:{fragment_dir}",
+            "--paths", f"home:{self.downloads_dir}",
+            vimeo_url
+        ]
+        browser_idx = command.index("--cookies-from-browser") + 1
+
+        for browser in browsers:
             logger.info(f"Trying {browser.capitalize()} browser cookies...")
-            command = [
-                "yt-dlp",
-                "--cookies-from-browser", browser,
-                "--referer", referer_url,
-                "-f", "bestvideo+bestaudio/best",
-                "--merge-output-format", "mp4",
-                "--downloader", "aria2c",
-                "--downloader-args", "aria2c:-x16 -s16 -k1M --console-log-level=warn --show-console-readout=true",
-                "--progress",
-                "--newline", # Force each progress update to be on a new line from yt-dlp
-                "--paths", f"temp:{self.temp_dir}",
-                "--paths", f"home:{self.downloads_dir}",
-                vimeo_url
-            ]
+            command[browser_idx] = browser
 
             try:
                 process = subprocess.Popen(
                     command,
                     stdout=subprocess.PIPE,
                     stderr=subprocess.STDOUT, # Merge stderr into stdout
-                    text=True,
-                    bufsize=1, 
-                    universal_newlines=True
+                    bufsize=0 # Unbuffered binary pipe, read directly by iter_output_lines
                 )
                 
+                # A reader thread parses output while this loop only renders
+                events: queue.Queue = queue.Queue()
+                reader = threading.Thread(
+                    target=read_output_events, args=(process.stdout, events), daemon=True
+                )
+                reader.start()
+
                 spinner_frames = ["⢿", "⣻", "⣽", "⣾", "⣷", "⣯", "⣟", "⡿"]
                 spinner_idx = 0
                 spinner_counter = 0  # Add counter to reduce spinner frequency
-                PROGRESS_LINE_WIDTH = 80
-                last_line_ended_with_cr = False
-                displaying_progress = False # New state variable
-                
-                # logger.info("Starting download...") # Moved to be per-browser attempt
-
-                while True:
-                    output_line_raw = process.stdout.readline()
-
-                    if not output_line_raw and process.poll() is not None:
-                        break 
-
-                    if output_line_raw:
-                        line_type, message = clean_progress_output(output_line_raw)
+                render_state = STATE_IDLE
+                reader_done = False
+
+                while not reader_done:
+                    # Wait up to IDLE_TIMEOUT for output, then take everything queued meanwhile
+                    try:
+                        queued = [events.get(timeout=IDLE_TIMEOUT)]
+                    except queue.Empty:
+                        queued = [[("IDLE", None)]]
+                    while True:
+                        try:
+                            queued.append(events.get_nowait())
+                        except queue.Empty:
+                            break
+                    batch = []
+                    for read_events in queued:
+                        if read_events is None:  # Reader reached EOF
+                            reader_done = True
+                        else:
+                            batch.extend(read_events)
+
+                    latest_progress = None  # Only the newest progress update of a batch is drawn
+                    advance_spinner = False
+                    for line_type, message in batch:
 
                         if line_type == "PROGRESS":
-                            # Progress always overwrites current line.
-                            sys.stdout.write(message.ljust(PROGRESS_LINE_WIDTH) + "\r")
-                            last_line_ended_with_cr = True
-                            displaying_progress = True # Set overall state
+                            latest_progress = message
+                            render_state = STATE_PROGRESS
                         elif line_type in ["STATUS_INFO", "STATUS_MERGE", "ERROR_LINE"]:
-                            if last_line_ended_with_cr:
+                            if latest_progress is not None:
+                                # Leave the last progress update visible above the status line
+                                write_status_line(latest_progress)
+                                latest_progress = None
+                            if render_state != STATE_IDLE:
                                 sys.stdout.write("\n") # Newline if previous was progress/spinner
                             logger.info(message)  # Use logger instead of direct stdout
-                            last_line_ended_with_cr = False
-                            displaying_progress = False # Reset overall state
+                            render_state = STATE_IDLE
                             if line_type == "ERROR_LINE":
                                 last_error_message = message 
-                        elif line_type == "IGNORE":
-                            if not displaying_progress: # Check overall state
+                        elif line_type in ["IGNORE", "IDLE"]:
+                            if render_state != STATE_PROGRESS:
                                 spinner_counter += 1
-                                if spinner_counter % 5 == 0:  # Only update spinner every 5 IGNORE lines
-                                    spinner_char = spinner_frames[spinner_idx]
-                                    spinner_idx = (spinner_idx + 1) % len(spinner_frames)
-                                    sys.stdout.write(f"{spinner_char} Processing...".ljust(PROGRESS_LINE_WIDTH) + "\r")
-                                    last_line_ended_with_cr = True
-                            # If displaying_progress is true, do nothing for IGNORE lines to keep progress visible
-                    
-                    sys.stdout.flush()
-                    # Removed 'elif process.poll() is None: pass' as it's covered by readline blocking
-            
-                if last_line_ended_with_cr:
+                                # Advance on every idle tick, or every 5 IGNORE lines while output flows
+                                if line_type == "IDLE" or spinner_counter % 5 == 0:
+                                    advance_spinner = True
+                            # While progress is shown, do nothing for IGNORE lines to keep it visible
+
+                    # At most one redraw, and one flush, per tick
+                    if latest_progress is not None:
+                        # Progress always overwrites current line.
+                        write_status_line(latest_progress)
+                    elif advance_spinner and render_state != STATE_PROGRESS:
+                        spinner_char = spinner_frames[spinner_idx]
+                        spinner_idx = (spinner_idx + 1) % len(spinner_frames)
+                        write_status_line(f"{spinner_char} Processing...")
+                        render_state = STATE_SPINNER
+                    sys.stdout.buffer.flush()
+
+                if render_state != STATE_IDLE:
                     sys.stdout.write("\n")
                 sys.stdout.flush()
 
-                process.wait() 
+                try:
+                    process.wait(timeout=READER_EXIT_GRACE)
+                except subprocess.TimeoutExpired:
+                    reader.join()  # Already past its final None, so this returns at once
+                    # The reader is gone but yt-dlp isn't: nothing drains the pipe any more
+                    logger.warning("Output reader stopped; terminating yt-dlp.")
+                    process.kill()
+                    process.wait()
                 if process.returncode == 0:
                     logger.info(f"✅ Download successful using {browser.capitalize()} browser cookies!")
                     download_successful = True
+                    self.save_last_browser(browser)
                     break # Exit browser loop on success
                 else:
                     logger.warning(f"❌ {browser.capitalize()} browser failed (exit code {process.returncode})")
@@ -314,7 +830,14 @@ class VimeoDownloader:
             self.cleanup()
 
 def main():
-    downloader = VimeoDownloader()
+    parser = argparse.ArgumentParser(description="Download private embedded Vimeo videos.")
+    parser.add_argument(
+        '--fast', action='store_true',
+        help="use larger aria2c segments, i.e. fewer range requests (for fast links)"
+    )
+    args = parser.parse_args()
+
+    downloader = VimeoDownloader(fast=args.fast)
     downloader.run()
 
 if __name__ == "__main__":